@@ -4,8 +4,12 @@ import time
 import asyncio
 from datetime import datetime
 import os
+import logging
 from data_fetcher import DataFetcher
 from ai_assistant import AIAssistant
+from ticker_index import TickerIndex, MAX_INDEX_AGE
+
+logger = logging.getLogger(__name__)
 
 st.set_page_config(
     page_title="Gaus Take Home Assignment",
@@ -28,6 +32,12 @@ if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'last_update' not in st.session_state:
     st.session_state.last_update = None
+if 'ticker_index_retry_at' not in st.session_state:
+    st.session_state.ticker_index_retry_at = 0
+if 'ticker_index_error' not in st.session_state:
+    st.session_state.ticker_index_error = None
+if 'loaded_csv_id' not in st.session_state:
+    st.session_state.loaded_csv_id = None
 
 # Initialize data fetcher and AI assistant
 @st.cache_resource
@@ -38,8 +48,53 @@ def get_data_fetcher():
 def get_ai_assistant():
     return AIAssistant()
 
+# Symbol index is built from Finnhub and cached on disk, so validation never hits the network.
+# The ttl picks up the daily on-disk refresh. A failed build raises, and st.cache_resource
+# doesn't cache exceptions, so it's retried later.
+@st.cache_resource(ttl=MAX_INDEX_AGE)
+def get_ticker_index():
+    return TickerIndex.load_or_build(get_data_fetcher())
+
+def load_ticker_index():
+    if not data_fetcher.finnhub_key:
+        st.session_state.ticker_index_error = "FINNHUB_API_KEY is not set"
+        return None
+    # Don't hammer Finnhub on every rerun while it's failing
+    if time.time() < st.session_state.ticker_index_retry_at:
+        return None
+    try:
+        index = get_ticker_index()
+    except Exception as e:
+        logger.exception("Could not build ticker index")
+        st.session_state.ticker_index_error = f"couldn't download the symbol list from Finnhub ({e}). Retrying in a minute"
+        st.session_state.ticker_index_retry_at = time.time() + 60
+        return None
+    st.session_state.ticker_index_error = None
+    return index
+
 data_fetcher = get_data_fetcher()
 ai_assistant = get_ai_assistant()
+ticker_index = load_ticker_index()
+
+def validate_tickers(raw_tickers):
+    """Split raw input into (valid, invalid) before any upstream request is made"""
+    if ticker_index is None:
+        # Index couldn't be built (e.g. no Finnhub key), accept input as-is
+        cleaned = [t.strip().upper() for t in raw_tickers if isinstance(t, str) and t.strip()]
+        return list(dict.fromkeys(cleaned)), []
+    return ticker_index.split(raw_tickers)
+
+def report_invalid_tickers(invalid):
+    if invalid:
+        shown = ', '.join(invalid[:20])
+        more = f" (+{len(invalid) - 20} more)" if len(invalid) > 20 else ""
+        st.warning(f"Skipped {len(invalid)} unknown ticker(s): {shown}{more}")
+
+def complete_last_ticker(symbol):
+    """Replace the symbol being typed with the picked completion"""
+    tokens = [t.strip() for t in st.session_state.ticker_input.split(',')]
+    tokens[-1] = symbol
+    st.session_state.ticker_input = ', '.join(tokens)
 
 def fetch_all_data():
     if not st.session_state.tickers:
@@ -80,16 +135,22 @@ st.markdown("Track your portfolio with real-time data, news, and AI-powered insi
 # Sidebar
 with st.sidebar:
     st.header("Portfolio Management")
+
+    if ticker_index is None:
+        st.warning(f"Ticker validation is off: {st.session_state.ticker_index_error}.")
     
     # CSV Upload
     uploaded_file = st.file_uploader("Upload Portfolio CSV", type=['csv'])
     
-    if uploaded_file is not None:
+    # Only process a file once, not on every rerun while it stays attached to the uploader
+    if uploaded_file is not None and uploaded_file.file_id != st.session_state.loaded_csv_id:
+        st.session_state.loaded_csv_id = uploaded_file.file_id
         try:
             df = pd.read_csv(uploaded_file)
             if 'Ticker' in df.columns:
-                new_tickers = df['Ticker'].str.upper().tolist()
-                if new_tickers != st.session_state.tickers:
+                new_tickers, invalid = validate_tickers(df['Ticker'].dropna().astype(str).unique())
+                report_invalid_tickers(invalid)
+                if new_tickers and new_tickers != st.session_state.tickers:
                     st.session_state.tickers = new_tickers
                     st.success(f"Loaded {len(new_tickers)} tickers")
                     fetch_all_data()
@@ -100,14 +161,28 @@ with st.sidebar:
     
     # Manual ticker entry
     st.subheader("Or Add Tickers Manually")
-    ticker_input = st.text_input("Enter ticker symbols (comma-separated)")
+    ticker_input = st.text_input("Enter ticker symbols (comma-separated)", key="ticker_input")
+
+    # Completions for the last symbol being typed, click one to fill it in
+    if ticker_input and ticker_index is not None:
+        last_token = ticker_input.split(',')[-1]
+        exact = ticker_index.normalize(last_token)
+        suggestions = [s for s in ticker_index.autocomplete(last_token, limit=9) if s != exact][:8]
+        if suggestions:
+            st.caption("Matching symbols:")
+            suggestion_cols = st.columns(4)
+            for i, symbol in enumerate(suggestions):
+                with suggestion_cols[i % 4]:
+                    st.button(symbol, key=f"suggest_{symbol}", on_click=complete_last_ticker, args=(symbol,))
     
     if st.button("Add Tickers"):
         if ticker_input:
-            new_tickers = [t.strip().upper() for t in ticker_input.split(',')]
-            st.session_state.tickers = list(set(st.session_state.tickers + new_tickers))
-            st.success(f"Added tickers: {', '.join(new_tickers)}")
-            fetch_all_data()
+            new_tickers, invalid = validate_tickers(ticker_input.split(','))
+            report_invalid_tickers(invalid)
+            if new_tickers:
+                st.session_state.tickers = list(set(st.session_state.tickers + new_tickers))
+                st.success(f"Added tickers: {', '.join(new_tickers)}")
+                fetch_all_data()
     
     # Current portfolio
     if st.session_state.tickers:
@@ -64,7 +64,20 @@ class DataFetcher:
                 }
         
         return stock_data
-    
+
+    def get_symbol_list(self, exchange: str = "US") -> List[str]:
+        """Fetch every listed symbol for an exchange (used to build the local ticker index)"""
+        url = f"{self.finnhub_base}/stock/symbol"
+        params = {
+            'exchange': exchange,
+            'token': self.finnhub_key
+        }
+
+        response = requests.get(url, params=params, timeout=30)
+        response.raise_for_status()
+
+        return [item.get('symbol', '') for item in response.json() if item.get('symbol')]
+
     def get_news(self, tickers: List[str]) -> Dict[str, List[Dict]]:
         """Fetch breaking news for given tickers and extract full article text"""
         news_data = {}
@@ -0,0 +1,152 @@
+import os
+import time
+
+import pytest
+
+from ticker_index import TickerIndex
+
+SYMBOLS = ['A', 'AA', 'AAP', 'AAPL', 'BAC-PL', 'BRK.A', 'BRK.B', 'F', 'MSFT', 'SPY']
+
+
+class FakeFetcher:
+    def __init__(self, symbols=None, error=None):
+        self.symbols = symbols or []
+        self.error = error
+        self.calls = 0
+
+    def get_symbol_list(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.symbols
+
+
+@pytest.fixture
+def index():
+    return TickerIndex(SYMBOLS)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('aapl', 'AAPL'),
+    ('  AAPL ', 'AAPL'),
+    ('$msft', 'MSFT'),
+    ('NASDAQ:AAPL', 'AAPL'),
+    ('AAPL:US', 'AAPL'),
+    ('NASDAQ:AAPL:US', 'AAPL'),
+    ('NYSEARCA:SPY', 'SPY'),
+    ('NYSEAMERICAN:SPY', 'SPY'),
+    ('OTCMKTS:MSFT', 'MSFT'),
+    ('SPY:NYSEARCA', 'SPY'),
+    ('AAPL.US', 'AAPL'),
+    ('aapl us', 'AAPL'),
+    ('BRK-B', 'BRK.B'),
+    ('brk/a', 'BRK.A'),
+    ('BRK B', 'BRK.B'),
+    ('BRK.A', 'BRK.A'),
+    ('BAC-PL', 'BAC-PL'),
+    ('F.P', None),
+    ('AAPL:N', None),
+    ('FOO:AAPL', None),
+    ('NASDAQ:', None),
+    ('APPL', None),
+    ('', None),
+    (None, None),
+])
+def test_normalize(index, raw, expected):
+    assert index.normalize(raw) == expected
+
+
+def test_autocomplete(index):
+    assert index.autocomplete('aa') == ['AA', 'AAP', 'AAPL']
+    assert index.autocomplete('brk-') == ['BRK.A', 'BRK.B']
+    assert index.autocomplete('BAC-') == ['BAC-PL']
+    assert index.autocomplete('a', limit=2) == ['A', 'AA']
+    assert index.autocomplete('  ') == []
+
+
+def test_split_dedupes_and_keeps_order(index):
+    valid, invalid = index.split(['msft', ' AAPL ', 'xyz', 'AAPL', 'brk-b', 'BRK.B', ' xyz', '', None, float('nan')])
+    assert valid == ['MSFT', 'AAPL', 'BRK.B']
+    assert invalid == ['xyz']
+
+
+def test_save_and_load_roundtrip(index, tmp_path):
+    path = str(tmp_path / 'cache' / 'symbols.txt.gz')
+    index.save(path)
+    assert TickerIndex.load(path).symbols == index.symbols
+
+
+def test_load_or_build_uses_cached_file(index, tmp_path):
+    path = str(tmp_path / 'symbols.txt.gz')
+    index.save(path)
+    fetcher = FakeFetcher(['ZZZ'])
+
+    assert TickerIndex.load_or_build(fetcher, path).symbols == index.symbols
+    assert fetcher.calls == 0
+
+
+def test_load_or_build_fetches_and_saves(tmp_path):
+    path = str(tmp_path / 'symbols.txt.gz')
+    built = TickerIndex.load_or_build(FakeFetcher(SYMBOLS), path)
+
+    assert built.symbols == sorted(SYMBOLS)
+    assert TickerIndex.load(path).symbols == sorted(SYMBOLS)
+
+
+def test_load_or_build_refreshes_stale_file(index, tmp_path):
+    path = str(tmp_path / 'symbols.txt.gz')
+    index.save(path)
+    day_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(path, (day_ago, day_ago))
+    fetcher = FakeFetcher(SYMBOLS + ['NEWIPO'])
+
+    built = TickerIndex.load_or_build(fetcher, path)
+
+    assert fetcher.calls == 1
+    assert 'NEWIPO' in built
+    assert 'NEWIPO' in TickerIndex.load(path)
+
+
+def test_load_or_build_falls_back_to_stale_file(index, tmp_path, caplog):
+    path = str(tmp_path / 'symbols.txt.gz')
+    index.save(path)
+    day_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(path, (day_ago, day_ago))
+    fetcher = FakeFetcher(error=RuntimeError('429'))
+
+    built = TickerIndex.load_or_build(fetcher, path)
+
+    assert fetcher.calls == 1
+    assert built.symbols == index.symbols
+    assert 'using stale copy' in caplog.text
+
+
+def test_load_or_build_rebuilds_corrupt_file(tmp_path, caplog):
+    path = tmp_path / 'symbols.txt.gz'
+    path.write_bytes(b'not gzip')
+
+    built = TickerIndex.load_or_build(FakeFetcher(SYMBOLS), str(path))
+
+    assert built.symbols == sorted(SYMBOLS)
+    assert 'Could not load ticker index' in caplog.text
+
+
+def test_load_or_build_raises_when_fetch_fails(tmp_path):
+    with pytest.raises(RuntimeError):
+        TickerIndex.load_or_build(FakeFetcher(error=RuntimeError('429')), str(tmp_path / 'symbols.txt.gz'))
+
+
+def test_load_or_build_raises_on_empty_symbol_list(tmp_path):
+    with pytest.raises(ValueError):
+        TickerIndex.load_or_build(FakeFetcher([]), str(tmp_path / 'symbols.txt.gz'))
+
+
+def test_load_or_build_survives_failed_save(tmp_path, monkeypatch, caplog):
+    def fail_save(self, path):
+        raise OSError('read-only file system')
+
+    monkeypatch.setattr(TickerIndex, 'save', fail_save)
+    built = TickerIndex.load_or_build(FakeFetcher(SYMBOLS), str(tmp_path / 'symbols.txt.gz'))
+
+    assert built.symbols == sorted(SYMBOLS)
+    assert 'Could not save ticker index' in caplog.text
@@ -0,0 +1,164 @@
+import bisect
+import gzip
+import logging
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+# Built from Finnhub's symbol list and reused across sessions until it's older than MAX_INDEX_AGE,
+# so new listings (IPOs, ETFs, renames) show up within a day
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "us_symbols.txt.gz")
+MAX_INDEX_AGE = 24 * 60 * 60  # seconds
+
+# Exchange tags people paste from other sites (Yahoo, Reuters, Bloomberg) that Finnhub's US list doesn't use.
+# Single letters (N, O, P, K...) are left out on purpose: they double as share class / preferred letters.
+EXCHANGE_SUFFIXES = {'US', 'OQ', 'PK', 'OB', 'NYSE', 'NASDAQ', 'AMEX', 'ARCA', 'BATS', 'OTC'}
+
+# Tags that can appear on either side of a ':' (NYSEARCA:SPY from Google Finance, OTCMKTS:... from Yahoo)
+EXCHANGE_TAGS = EXCHANGE_SUFFIXES | {'NYSEARCA', 'NYSEAMERICAN', 'NYSEMKT', 'OTCMKTS', 'CBOE'}
+
+logger = logging.getLogger(__name__)
+
+
+class TickerIndex:
+    """Local, sorted index of known symbols for validating and autocompleting tickers without any API calls"""
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        # Sorted array for prefix lookups, set for exact membership
+        self.symbols = sorted({s.strip().upper() for s in symbols if s and s.strip()})
+        self._lookup = frozenset(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._lookup
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "TickerIndex":
+        """Load an index saved with save() (one symbol per line, gzipped)"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls(f.read().splitlines())
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Write the index to disk as a gzipped, newline-separated symbol list"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write('\n'.join(self.symbols))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_or_build(cls, data_fetcher, path: str = DEFAULT_INDEX_PATH, max_age: float = MAX_INDEX_AGE) -> "TickerIndex":
+        """Load the on-disk index, rebuilding it from Finnhub when it's missing or older than `max_age` seconds.
+        A failed rebuild falls back to the stale file if there is one, otherwise it raises
+        so callers don't cache a failed build."""
+        cached = None
+        if os.path.exists(path):
+            try:
+                cached = cls.load(path)
+            except Exception as e:
+                logger.warning("Could not load ticker index from %s, rebuilding: %s", path, e)
+            else:
+                if time.time() - os.path.getmtime(path) < max_age:
+                    return cached
+
+        try:
+            index = cls(data_fetcher.get_symbol_list())
+            if not index:
+                raise ValueError("Finnhub returned an empty symbol list")
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning("Could not refresh ticker index, using stale copy from %s: %s", path, e)
+            return cached
+
+        # Failing to write the cache only costs a rebuild next time
+        try:
+            index.save(path)
+        except Exception as e:
+            logger.warning("Could not save ticker index to %s: %s", path, e)
+        return index
+
+    def normalize(self, ticker: str) -> Optional[str]:
+        """Map user input to the canonical symbol, or None if it isn't a known ticker.
+        Handles case, '$' prefixes, exchange prefixes/suffixes (NASDAQ:AAPL, AAPL.US)
+        and share class separators (BRK-B, BRK/B, BRK B -> BRK.B)."""
+        if not isinstance(ticker, str):
+            return None
+
+        cleaned = ticker.strip().upper().lstrip('$')
+        if not cleaned:
+            return None
+
+        # NASDAQ:AAPL, AAPL:US or NASDAQ:AAPL:US, anything else is ambiguous
+        if ':' in cleaned:
+            parts = [part.strip() for part in cleaned.split(':')]
+            if parts[0] in EXCHANGE_TAGS:
+                parts = parts[1:]
+            if len(parts) > 1 and parts[-1] in EXCHANGE_TAGS:
+                parts = parts[:-1]
+            if len(parts) != 1:
+                return None
+            cleaned = parts[0]
+
+        # Listed as typed (this also covers symbols that contain '-' or '/')
+        if cleaned in self._lookup:
+            return cleaned
+
+        dotted = self._dotted(cleaned)
+        if dotted in self._lookup:
+            return dotted
+
+        # Only strip a trailing suffix when the full form isn't a real symbol, so BRK.A stays intact
+        base, dot, suffix = dotted.rpartition('.')
+        if dot and suffix in EXCHANGE_SUFFIXES and base in self._lookup:
+            return base
+
+        return None
+
+    @staticmethod
+    def _dotted(ticker: str) -> str:
+        """Rewrite share class separators to Finnhub's '.' form (BRK-B, BRK/B, BRK B -> BRK.B)"""
+        for sep in ('-', '/', ' '):
+            ticker = ticker.replace(sep, '.')
+        return ticker
+
+    def is_valid(self, ticker: str) -> bool:
+        return self.normalize(ticker) is not None
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return up to `limit` known symbols starting with `prefix`, in sorted order (an exact match comes first)"""
+        prefix = prefix.strip().upper().lstrip('$')
+        if not prefix:
+            return []
+
+        matches = set()
+        for candidate in {prefix, self._dotted(prefix)}:
+            start = bisect.bisect_left(self.symbols, candidate)
+            end = bisect.bisect_left(self.symbols, candidate + '\uffff', lo=start)
+            matches.update(self.symbols[start:min(end, start + limit)])
+        return sorted(matches)[:limit]
+
+    def split(self, tickers: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Partition raw input into (valid canonical tickers, invalid raw entries).
+        Both lists are de-duplicated and keep input order, so large CSVs only pay for each distinct value once."""
+        valid, invalid = [], []
+        seen_raw, seen_valid = set(), set()
+
+        for raw in tickers:
+            if not isinstance(raw, str):
+                continue
+            raw = raw.strip()
+            if not raw or raw in seen_raw:
+                continue
+            seen_raw.add(raw)
+
+            symbol = self.normalize(raw)
+            if symbol is None:
+                invalid.append(raw)
+            elif symbol not in seen_valid:
+                seen_valid.add(symbol)
+                valid.append(symbol)
+
+        return valid, invalid